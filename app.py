@@ -1,53 +1,110 @@
+import io
+import altair as alt
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-from wordcloud import WordCloud
-from utils import load_and_clean_data
+from utils import load_and_clean_data, slice_years
 
-# Download and load data
-@st.cache_data
+# Download and load data. Cached as a shared resource so reruns and sessions
+# reuse one DataFrame instead of copying it; treat the result as read-only
+@st.cache_resource(show_spinner='Loading CORD-19…')
 def load_data():
     return load_and_clean_data()
 
-def plot_publications_per_year(df, year_range):
-    yearly = df[(df['year'] >= year_range[0]) & (df['year'] <= year_range[1])]['year'].value_counts().sort_index()
-    fig, ax = plt.subplots()
-    sns.barplot(x=yearly.index, y=yearly.values, ax=ax, palette='Blues')
-    ax.set_xlabel('Year')
-    ax.set_ylabel('Number of Publications')
-    ax.set_title('Publications per Year')
-    plt.xticks(rotation=45)
-    st.pyplot(fig)
-
-def plot_top_journals(df, year_range):
-    filtered = df[(df['year'] >= year_range[0]) & (df['year'] <= year_range[1])]
-    top_journals = filtered['journal'].value_counts().head(10)
-    fig, ax = plt.subplots()
-    sns.barplot(y=top_journals.index, x=top_journals.values, ax=ax, palette='Greens')
-    ax.set_xlabel('Number of Papers')
-    ax.set_ylabel('Journal')
-    ax.set_title('Top Journals')
-    st.pyplot(fig)
-
-def plot_wordcloud(df, year_range):
-    filtered = df[(df['year'] >= year_range[0]) & (df['year'] <= year_range[1])]
-    text = ' '.join(filtered['title'].dropna().astype(str))
-    wc = WordCloud(width=800, height=400, background_color='white').generate(text)
-    fig, ax = plt.subplots(figsize=(10, 5))
-    ax.imshow(wc, interpolation='bilinear')
-    ax.axis('off')
-    st.pyplot(fig)
-
-def plot_source_distribution(df, year_range):
-    filtered = df[(df['year'] >= year_range[0]) & (df['year'] <= year_range[1])]
-    source_counts = filtered['source_x'].value_counts()
-    fig, ax = plt.subplots()
-    sns.barplot(y=source_counts.index, x=source_counts.values, ax=ax, palette='Purples')
-    ax.set_xlabel('Number of Papers')
-    ax.set_ylabel('Source')
-    ax.set_title('Distribution by Source')
-    st.pyplot(fig)
+# Shared like load_data so reruns don't copy the year x journal table; read-only
+@st.cache_resource
+def load_summaries():
+    # Per-year count tables, so slider changes only touch a few thousand rows
+    df = load_data()
+    yearly = df.groupby('year').size()
+    year_journal = df.groupby(['year', 'journal'], observed=True).size().unstack(fill_value=0)
+    year_source = df.groupby(['year', 'source_x'], observed=True).size().unstack(fill_value=0)
+    return yearly, year_journal, year_source
+
+# Per-range results are cached on the year bounds rather than the DataFrame so
+# the cache key stays small and revisiting a range skips the work entirely
+@st.cache_data
+def _yearly_counts(year_lo, year_hi):
+    yearly, _, _ = load_summaries()
+    return yearly.loc[year_lo:year_hi]
+
+@st.cache_data
+def _journal_counts(year_lo, year_hi):
+    _, year_journal, _ = load_summaries()
+    counts = year_journal.loc[year_lo:year_hi].sum()
+    return counts[counts > 0].nlargest(10)
+
+@st.cache_data
+def _source_counts(year_lo, year_hi):
+    _, _, year_source = load_summaries()
+    counts = year_source.loc[year_lo:year_hi].sum()
+    return counts[counts > 0].sort_values(ascending=False)
+
+@st.cache_data
+def _title_freqs(year_lo, year_hi):
+    # wordcloud pulls in matplotlib, so it is only imported when needed
+    from wordcloud import STOPWORDS
+    
+    # Count title words directly instead of joining every title into one string
+    titles = slice_years(load_data(), year_lo, year_hi)['title'].dropna().astype(str)
+    words = titles.str.lower().str.findall(r'[a-z]{3,}').explode()
+    words = words[~words.isin(STOPWORDS)]
+    return words.value_counts(sort=False).nlargest(200).to_dict()
+
+@st.cache_data
+def _wordcloud_png(year_lo, year_hi):
+    from wordcloud import WordCloud
+    
+    freqs = _title_freqs(year_lo, year_hi)
+    wc = WordCloud(width=800, height=400, background_color='white').generate_from_frequencies(freqs)
+    buf = io.BytesIO()
+    wc.to_image().save(buf, format='PNG')
+    return buf.getvalue()
+
+def _count_frame(counts, label):
+    return counts.rename_axis(label).reset_index(name='count')
+
+def plot_publications_per_year(year_range):
+    yearly = _count_frame(_yearly_counts(*year_range), 'year')
+    chart = alt.Chart(yearly, title='Publications per Year').mark_bar().encode(
+        x=alt.X('year:O', title='Year'),
+        y=alt.Y('count:Q', title='Number of Publications'),
+    )
+    st.altair_chart(chart)
+
+def plot_top_journals(year_range):
+    top_journals = _count_frame(_journal_counts(*year_range), 'journal')
+    chart = alt.Chart(top_journals, title='Top Journals').mark_bar().encode(
+        x=alt.X('count:Q', title='Number of Papers'),
+        y=alt.Y('journal:N', sort='-x', title='Journal'),
+    )
+    st.altair_chart(chart)
+
+def plot_wordcloud(year_range):
+    st.image(_wordcloud_png(*year_range))
+
+def plot_source_distribution(year_range):
+    source_counts = _count_frame(_source_counts(*year_range), 'source_x')
+    chart = alt.Chart(source_counts, title='Distribution by Source').mark_bar().encode(
+        x=alt.X('count:Q', title='Number of Papers'),
+        y=alt.Y('source_x:N', sort='-x', title='Source'),
+    )
+    st.altair_chart(chart)
+
+PLOT_SECTIONS = {
+    'Year': ('Publications per Year', plot_publications_per_year),
+    'Journals': ('Top Journals', plot_top_journals),
+    'Wordcloud': ('Wordcloud of Title Words', plot_wordcloud),
+    'Source': ('Distribution by Source', plot_source_distribution),
+}
+
+# Only the selected plot is computed, and switching views reruns just this
+# fragment rather than the whole page
+@st.fragment
+def _plots_section(year_range):
+    view = st.radio('View', list(PLOT_SECTIONS), horizontal=True, label_visibility='collapsed')
+    header, plot = PLOT_SECTIONS[view]
+    st.header(header)
+    plot(year_range)
 
 def main():
     st.title('CORD-19 Metadata Analysis')
@@ -69,20 +126,11 @@ def main():
         min_year, max_year = int(df['year'].min()), int(df['year'].max())
         year_range = st.sidebar.slider('Select Year Range', min_year, max_year, (min_year, max_year))
         
-        st.header('Publications per Year')
-        plot_publications_per_year(df, year_range)
-        
-        st.header('Top Journals')
-        plot_top_journals(df, year_range)
-        
-        st.header('Wordcloud of Title Words')
-        plot_wordcloud(df, year_range)
+        filtered_data = slice_years(df, *year_range)
         
-        st.header('Distribution by Source')
-        plot_source_distribution(df, year_range)
+        _plots_section(year_range)
         
         st.header('Sample Data')
-        filtered_data = df[(df['year'] >= year_range[0]) & (df['year'] <= year_range[1])]
         st.dataframe(filtered_data.head(20))
         
         # Show summary statistics
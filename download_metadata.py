@@ -17,6 +17,7 @@ import os
 import zipfile
 import tempfile
 import shutil
+from functools import lru_cache
 from pathlib import Path
 
 try:
@@ -25,11 +26,27 @@ except ImportError:
     print("Error: Kaggle API not installed. Please run: pip install kaggle")
     exit(1)
 
+# Buffer size for extracting metadata.csv from the multi-GB archive
+COPY_BUFFER_SIZE = 4 * 1024 * 1024
 
-def download_metadata_only():
+
+@lru_cache(maxsize=None)
+def get_kaggle_api():
+    """
+    Return an authenticated Kaggle API handle, reused across calls
+    """
+    api = KaggleApi()
+    api.authenticate()
+    return api
+
+
+def download_metadata_only(api=None):
     """
     Download only metadata.csv from CORD-19 dataset
     
+    An already authenticated KaggleApi can be passed in; otherwise the
+    shared handle from get_kaggle_api() is used.
+    
     This function:
     1. Checks if metadata.csv already exists
     2. Downloads the dataset to a temporary directory
@@ -48,8 +65,8 @@ def download_metadata_only():
     
     # Step 2: Initialize Kaggle API
     try:
-        api = KaggleApi()
-        api.authenticate()
+        if api is None:
+            api = get_kaggle_api()
         print("✓ Kaggle API authenticated successfully")
     except Exception as e:
         print(f"❌ Failed to authenticate with Kaggle API: {e}")
@@ -100,8 +117,8 @@ def download_metadata_only():
                 
                 # Extract to current directory
                 with zip_ref.open(metadata_in_zip) as source:
-                    with open(metadata_file, 'wb') as target:
-                        shutil.copyfileobj(source, target)
+                    with open(metadata_file, 'wb', buffering=COPY_BUFFER_SIZE) as target:
+                        shutil.copyfileobj(source, target, length=COPY_BUFFER_SIZE)
                 
                 print(f"✓ Extracted {metadata_file} to current directory")
                 
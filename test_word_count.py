@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Test script to check abstract word counts match str.split()
+"""
+
+import sys
+
+import pandas as pd
+import pyarrow as pa
+
+import utils
+
+# Every character str.split() treats as whitespace, plus non-whitespace
+# neighbours of the multi-byte ones to catch off-by-one byte tables
+WHITESPACE = [chr(c) for c in range(sys.maxunicode + 1) if chr(c).isspace()]
+NEAR_MISSES = ['\x08', '\x0e', '\x1b', '\x21', '\x84', '\x86', '\xa1', '\u1681',
+               '\u200b', '\u2027', '\u202a', '\u202e', '\u2030', '\u205e',
+               '\u2060', '\u3001', '\xe9', '\u6f22', '\U0001f600']
+
+def sample_texts():
+    texts = [None, '', 'plain ascii words']
+    for w in WHITESPACE:
+        texts += [w, f'a{w}b', f'{w}a{w}{w}b{w}', f'\u6f22{w}\U0001f600{w}\xe9']
+    for c in NEAR_MISSES:
+        texts += [c, f'a{c}b', f' {c} ']
+    return texts
+
+def check(label):
+    texts = sample_texts()
+    series = pd.Series(texts, dtype=pd.ArrowDtype(pa.string()))
+    expected = [len(t.split()) if t else 0 for t in texts]
+
+    mismatches = [t for t, got, exp in zip(texts, utils._count_words(series), expected)
+                  if got != exp]
+    # A sliced series has a non-zero Arrow offset
+    sliced = utils._count_words(series.iloc[5:]).tolist()
+    if sliced != expected[5:]:
+        mismatches.append('<sliced series>')
+
+    if mismatches:
+        print(f"✗ {label}: {len(mismatches)} mismatches, e.g. {mismatches[:5]!r}")
+        return False
+    print(f"✓ {label}: {len(texts)} strings match str.split()")
+    return True
+
+def main():
+    print("Testing abstract word counts against str.split()...")
+
+    ok = True
+    if utils._word_count_kernel() is not None:
+        ok &= check("Numba kernel")
+    else:
+        print("- Numba not installed, skipping kernel check")
+
+    # Force the regex fallback used when Numba is unavailable
+    kernel = utils._word_count_kernel
+    utils._word_count_kernel = lambda: None
+    try:
+        ok &= check("Regex fallback")
+    finally:
+        utils._word_count_kernel = kernel
+
+    if not ok:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
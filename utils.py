@@ -1,10 +1,28 @@
 """
 Utility functions for CORD-19 dataset analysis
 """
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+import importlib.util
 import os
 import subprocess
 import sys
+import tempfile
+from functools import lru_cache
+
+PARQUET_CACHE = 'metadata.parquet'
+# Bump when the cleaned schema or cleaning logic changes to invalidate caches,
+# including the word-counting rules in _word_count_kernel/_count_words
+CACHE_VERSION = b'1'
+CACHE_VERSION_KEY = b'cord19_cache_version'
+# types_mapper keeping Arrow string columns Arrow-backed when converting to pandas
+ARROW_STRINGS = {pa.string(): pd.ArrowDtype(pa.string())}.get
+COLUMNS = ['title', 'journal', 'source_x', 'abstract', 'publish_time']
+CLEAN_COLUMNS = ['title', 'journal', 'source_x', 'abstract', 'year', 'abstract_word_count']
 
 def download_dataset():
     """
@@ -29,33 +47,256 @@ def download_dataset():
         print("metadata.csv already exists, skipping download")
         return True
 
+@lru_cache(maxsize=None)
+def _word_count_kernel():
+    """
+    Compile the Numba word-count kernel, or return None without Numba
+    
+    Numba is imported here rather than at module level so that loads served
+    from the Parquet cache don't pay for it. Run test_word_count.py after
+    changing the whitespace tables, and bump CACHE_VERSION if counts change.
+    """
+    try:
+        from numba import njit, prange
+    except ImportError:
+        return None
+    
+    @njit(cache=True)
+    def space_len(data, j, end):
+        # Byte length of the whitespace character at data[j], or 0. Matches
+        # str.isspace(): ASCII 9-13 and 28-32 plus the UTF-8 encoded U+0085,
+        # U+00A0, U+1680, U+2000-U+200A, U+2028, U+2029, U+202F, U+205F, U+3000
+        c = data[j]
+        if c < 0x80:
+            return 1 if (9 <= c <= 13) or (28 <= c <= 32) else 0
+        if c == 0xC2 and j + 1 < end:
+            return 2 if data[j + 1] == 0x85 or data[j + 1] == 0xA0 else 0
+        if j + 2 >= end:
+            return 0
+        c1 = data[j + 1]
+        c2 = data[j + 2]
+        if c == 0xE1:
+            return 3 if c1 == 0x9A and c2 == 0x80 else 0
+        if c == 0xE2 and c1 == 0x80:
+            return 3 if c2 <= 0x8A or c2 == 0xA8 or c2 == 0xA9 or c2 == 0xAF else 0
+        if c == 0xE2 and c1 == 0x81:
+            return 3 if c2 == 0x9F else 0
+        if c == 0xE3:
+            return 3 if c1 == 0x80 and c2 == 0x80 else 0
+        return 0
+    
+    @njit(cache=True, parallel=True)
+    def count_words(data, offsets, out):
+        # Count runs of non-whitespace characters in each UTF-8 string
+        for i in prange(len(out)):
+            n = 0
+            in_word = False
+            j = offsets[i]
+            end = offsets[i + 1]
+            while j < end:
+                step = space_len(data, j, end)
+                if step:
+                    in_word = False
+                    j += step
+                else:
+                    if not in_word:
+                        n += 1
+                    in_word = True
+                    j += 1
+            out[i] = n
+    
+    return count_words
+
+def _count_words(text):
+    """
+    Count words in each entry of a string Series as str.split() would
+    
+    Uses a Numba kernel over the Arrow string buffers when Numba is
+    installed, and Python's regex engine otherwise.
+    """
+    text = text.fillna('')
+    kernel = _word_count_kernel()
+    if kernel is None:
+        # Arrow-backed str.count uses RE2, whose \S is ASCII-only
+        return text.astype(object).str.count(r'\S+').astype('int32')
+    
+    arr = pa.array(text)
+    if isinstance(arr, pa.ChunkedArray):
+        arr = arr.combine_chunks()
+    arr = arr.cast(pa.large_string())
+    _, offsets_buf, data_buf = arr.buffers()
+    offsets = np.frombuffer(offsets_buf, dtype=np.int64, count=len(arr) + 1, offset=arr.offset * 8)
+    data = np.frombuffer(data_buf, dtype=np.uint8) if data_buf is not None else np.empty(0, dtype=np.uint8)
+    out = np.empty(len(arr), dtype=np.int32)
+    kernel(data, offsets, out)
+    return pd.Series(out, index=text.index)
+
+def _clean_with_pandas():
+    """
+    Read and clean metadata.csv with pandas
+    """
+    # Stream only the columns the app uses, dropping rows with missing title
+    # or publish_time batch by batch so the full file is never held in memory
+    dictionary = pa.dictionary(pa.int32(), pa.string())
+    reader = pacsv.open_csv('metadata.csv', convert_options=pacsv.ConvertOptions(
+        include_columns=COLUMNS,
+        column_types={'title': pa.string(), 'abstract': pa.string(),
+                      'publish_time': pa.string(),
+                      'journal': dictionary, 'source_x': dictionary},
+        strings_can_be_null=True,
+    ))
+    original_size = 0
+    batches = []
+    for batch in reader:
+        original_size += batch.num_rows
+        batches.append(batch.filter(pc.and_(pc.is_valid(batch['title']),
+                                            pc.is_valid(batch['publish_time']))))
+    table = pa.Table.from_batches(batches, schema=reader.schema)
+    print(f"Dropped {original_size - table.num_rows} rows with missing title or publish_time")
+    
+    # Dictionary columns become categories, strings stay Arrow-backed
+    df = table.to_pandas(types_mapper=ARROW_STRINGS)
+    
+    # Convert publish_time to datetime; it mixes full dates and bare years
+    df['publish_time'] = pd.to_datetime(df['publish_time'], format='mixed', errors='coerce')
+    df = df.dropna(subset=['publish_time'])
+    
+    # Extract year; publish_time is not needed afterwards
+    df['year'] = df['publish_time'].dt.year.astype('int16')
+    df = df.drop(columns='publish_time')
+    
+    return df
+
+def _clean_with_polars():
+    """
+    Read and clean metadata.csv with Polars, returning a pandas DataFrame
+    """
+    import polars as pl
+    
+    # Read everything as strings; publish_time mixes full dates and bare years
+    lf = pl.scan_csv('metadata.csv', infer_schema_length=0).select(COLUMNS)
+    
+    # Drop rows with missing title or publish_time while streaming the file,
+    # so the unfiltered rows are never held in memory
+    original_size = lf.select(pl.len()).collect().item()
+    df = lf.filter(
+        pl.col('title').is_not_null() & pl.col('publish_time').is_not_null()
+    ).collect(engine='streaming')
+    print(f"Dropped {original_size - df.height} rows with missing title or publish_time")
+    
+    # Convert publish_time to datetime, treating bare years as January 1st
+    publish_time = pl.col('publish_time')
+    df = df.with_columns(
+        pl.coalesce(
+            publish_time.str.to_date('%Y-%m-%d', strict=False),
+            (publish_time + '-01-01').str.to_date('%Y-%m-%d', strict=False),
+        ).cast(pl.Datetime).alias('publish_time')
+    ).drop_nulls(['publish_time'])
+    
+    # Extract year and categorize repeated strings
+    df = df.with_columns(
+        pl.col('publish_time').dt.year().cast(pl.Int16).alias('year'),
+        pl.col('journal').cast(pl.Categorical),
+        pl.col('source_x').cast(pl.Categorical),
+    ).drop('publish_time')
+    
+    # Match the Arrow-backed string columns produced by the pandas path
+    df = df.to_pandas()
+    for col in ['title', 'abstract']:
+        df[col] = df[col].astype(pd.ArrowDtype(pa.string()))
+    
+    return df
+
+def _parquet_cache_is_fresh():
+    """
+    Check that metadata.parquet exists and matches metadata.csv and CACHE_VERSION
+    """
+    if not os.path.exists(PARQUET_CACHE):
+        return False
+    if os.path.exists('metadata.csv') and os.path.getmtime('metadata.csv') > os.path.getmtime(PARQUET_CACHE):
+        print(f"metadata.csv is newer than {PARQUET_CACHE}, rebuilding cache")
+        return False
+    try:
+        metadata = pq.read_schema(PARQUET_CACHE).metadata or {}
+    except (OSError, pa.ArrowInvalid) as e:
+        print(f"Could not read {PARQUET_CACHE} ({e}), rebuilding cache")
+        return False
+    if metadata.get(CACHE_VERSION_KEY) != CACHE_VERSION:
+        print(f"{PARQUET_CACHE} was written by an older version, rebuilding cache")
+        return False
+    return True
+
+def _write_parquet_cache(df):
+    """
+    Write the cleaned frame to metadata.parquet
+    
+    The file is written to a temporary path and moved into place, so an
+    interrupted write never leaves a truncated cache behind. Failing to write
+    the cache is reported but not fatal.
+    """
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = {**(table.schema.metadata or {}), CACHE_VERSION_KEY: CACHE_VERSION}
+    tmp_path = None
+    try:
+        fd, tmp_path = tempfile.mkstemp(suffix='.tmp', prefix=os.path.basename(PARQUET_CACHE) + '.',
+                                        dir=os.path.dirname(os.path.abspath(PARQUET_CACHE)))
+        os.close(fd)
+        pq.write_table(table.replace_schema_metadata(metadata), tmp_path, compression='snappy')
+        os.replace(tmp_path, PARQUET_CACHE)
+    except OSError as e:
+        print(f"Could not write {PARQUET_CACHE}: {e}")
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
 def load_and_clean_data():
     """
     Load and clean the CORD-19 metadata
+
+    Polars is used for the CSV parse and cleaning when installed, falling back
+    to pandas otherwise. The cleaned frame is cached to metadata.parquet after
+    the first run so later loads skip the CSV parse entirely; the cache is
+    rebuilt when metadata.csv is newer or CACHE_VERSION has changed.
     """
+    # Reuse the cleaned frame from a previous run if available
+    if _parquet_cache_is_fresh():
+        print(f"Loading cleaned data from {PARQUET_CACHE}")
+        try:
+            table = pq.read_table(PARQUET_CACHE, columns=CLEAN_COLUMNS)
+            return table.to_pandas(types_mapper=ARROW_STRINGS)
+        except (OSError, pa.ArrowInvalid) as e:
+            print(f"Could not read {PARQUET_CACHE} ({e}), rebuilding cache")
+    
     # Ensure dataset is downloaded
     if not download_dataset():
         return None
     
-    # Load the data
-    df = pd.read_csv('metadata.csv', low_memory=False)
-    
-    # Drop rows with missing title or publish_time
-    original_size = len(df)
-    df = df.dropna(subset=['title', 'publish_time'])
-    print(f"Dropped {original_size - len(df)} rows with missing title or publish_time")
-    
-    # Convert publish_time to datetime
-    df['publish_time'] = pd.to_datetime(df['publish_time'], errors='coerce')
-    df = df.dropna(subset=['publish_time'])
+    # Polars is only imported here, so warm loads from Parquet don't pay for it
+    if importlib.util.find_spec('polars') is not None:
+        df = _clean_with_polars()
+    else:
+        df = _clean_with_pandas()
     
-    # Extract year
-    df['year'] = df['publish_time'].dt.year
+    # Count words in one place so both engines store identical counts
+    df['abstract_word_count'] = _count_words(df['abstract'])
     
-    # Add abstract word count
-    df['abstract_word_count'] = df['abstract'].fillna('').apply(lambda x: len(x.split()))
+    # Sort by year so year ranges can be selected as contiguous slices
+    df = df.sort_values('year', kind='stable').reset_index(drop=True)
     
     print(f"Final dataset shape: {df.shape}")
     print(f"Year range: {df['year'].min()} - {df['year'].max()}")
+    print(f"Memory usage: {df.memory_usage(deep=True).sum() / (1024*1024):.1f} MB")
+    
+    # Cache the cleaned frame for subsequent loads, tagged with CACHE_VERSION
+    _write_parquet_cache(df)
     
-    return df
\ No newline at end of file
+    return df
+
+def slice_years(df, lo, hi):
+    """
+    Return the rows of a year-sorted DataFrame with lo <= year <= hi
+
+    Uses binary search on the sorted year column, so the result is a slice
+    of the original frame rather than a masked copy.
+    """
+    a, b = np.searchsorted(df['year'].values, [lo, hi + 1])
+    return df.iloc[a:b]